@@ -3,7 +3,7 @@
 # • Lee latam_swaps_params.xlsx
 # • Escenarios: optimista, base, pesimista
 # • Modelo Vasicek: dr = α(μ – r)dt + σ dW
-# • Salida: gráfico + CSV con trayectorias
+# • Salida: gráfico + CSV con trayectorias + cubo .npz (Monte Carlo)
 
 from pathlib import Path
 import numpy as np
@@ -37,6 +37,7 @@ spread_mortgage = row["mortgage_variable_%"] / 100 - r0   # diferencia corta-hip
 plazo_meses = 180
 dt          = 1/12               # paso mensual
 FLOOR_SPREAD = 0.05              # 5 pp sobre la tasa simulada
+N_PATHS_CUBO = 2_000             # trayectorias por escenario (exposición, VaR)
 
 # ------------------------------------------------------------------
 # 2. Define escenarios
@@ -58,6 +59,19 @@ def sim_vasicek(alpha_a, mu_a, sigma_m, r0, n_steps, cap=0.015):
         rates[t] = r
     return rates
 
+def sim_vasicek_cubo(alpha_a, mu_a, sigma_m, r0, n_steps, n_paths,
+                     cap=0.015, seed=42):
+    """Misma dinámica que sim_vasicek, vectorizada sobre n_paths trayectorias."""
+    rng = np.random.default_rng(seed)
+    rates = np.empty((n_paths, n_steps))
+    r = np.full(n_paths, r0, dtype=float)
+    for t in range(n_steps):
+        dr_raw = alpha_a * (mu_a - r) * dt + sigma_m * rng.standard_normal(n_paths)
+        dr = np.clip(dr_raw, -cap, cap)
+        r = np.maximum(r + dr, 0.01)
+        rates[:, t] = r
+    return rates
+
 # ------------------------------------------------------------------
 # 3. Simula y guarda resultados
 # ------------------------------------------------------------------
@@ -87,6 +101,22 @@ csv_out = Path(__file__).with_name("sim_rates_bloque1.csv")
 df_out.to_csv(csv_out, index=False)
 print(f"✅ Trayectorias guardadas en {csv_out.name}")
 
+# ------------------------------------------------------------------
+# 3‑bis. Cubo Monte Carlo (paths × meses) para exposición y servicio
+# ------------------------------------------------------------------
+# Se guardan también (alpha, mu, sigma anual, r0) por escenario para que
+# los consumidores usen los mismos parámetros en los precios analíticos.
+cubo = {}
+for escenario, pars in ESC.items():
+    cubo[f"r_{escenario}"] = sim_vasicek_cubo(
+        alpha, pars["mu"], sigma_m, r0, plazo_meses, N_PATHS_CUBO
+    )
+    cubo[f"params_{escenario}"] = np.array([alpha, pars["mu"], sigma_a, r0])
+
+npz_out = Path(__file__).with_name("sim_cube_bloque1.npz")
+np.savez_compressed(npz_out, **cubo)
+print(f"✅ Cubo {N_PATHS_CUBO}×{plazo_meses} por escenario en {npz_out.name}")
+
 # ------------------------------------------------------------------
 # 4‑bis. Estadísticas rápidas para validar cada escenario
 # ------------------------------------------------------------------
@@ -4,6 +4,7 @@ import numpy as np
 import numpy_financial as npf
 import matplotlib.pyplot as plt
 from pathlib import Path
+from curvas import CurvaDescuento
 #  carpeta donde se guardarán todas las figuras de este bloque
 FIG_DIR = Path(__file__).with_name("figs_bloque2")
 FIG_DIR.mkdir(exist_ok=True)
@@ -24,18 +25,16 @@ N_MESES      = 180
 TASA_FIJA_EA = 0.13             # “tarifa de lista” 13 % EA
 r_fija_m     = (1 + TASA_FIJA_EA) ** (1/12) - 1
 
-# --------------------------- función genérica de VP
-def vp(cf, tasas_m):
-    """Valor presente descontando con las tasas_m mes a mes."""
-    # factor descuento acumulado: 1/∏(1+r_m)
-    df = np.cumprod(1 / (1 + tasas_m))
-    return np.sum(cf * df)
+# --------------------------- curva IBR fwd por escenario (se arma una sola vez)
+CURVAS = {esc: CurvaDescuento.estocastica(
+              ((1 + rates[f"r_{esc}"]).pow(1/12) - 1).values[:N_MESES])
+          for esc in ESC}
 
 # ====================== BLOQUE A  :  ESCENARIOS BASE / OPT / PES ======================
 result = {}
 for esc in ESC:
     # ------------- tasas mensuales
-    r_short_m = (1 + rates[f"r_{esc}"]).pow(1/12) - 1          # IBR fwd
+    curva     = CURVAS[esc]                                     # IBR fwd
     r_mort_m  = (1 + rates[f"hipoteca_var_{esc}"]).pow(1/12) - 1
 
     prima_m   = SPREAD_SWAP[esc] / 12
@@ -50,8 +49,8 @@ for esc in ESC:
         cf_fix.append(cuota_fija)
 
     # --------  Descuento **solamente con la curva IBR fwd** --------------
-    vp_var = vp(np.array(cf_var), r_short_m.iloc[:N_MESES].values)
-    vp_fix = vp(np.array(cf_fix), r_short_m.iloc[:N_MESES].values)
+    vp_var = curva.vp(cf_var)
+    vp_fix = curva.vp(cf_fix)
 
     result[esc] = dict(VPN_variable=vp_var,
                        VPN_fija=vp_fix,
@@ -98,7 +97,7 @@ spreads_pb = np.arange(150, 351, 50)   # 150–350 pb
 tornado = {}                           # dict escenario → ahorro (array len=5)
 
 for esc in ESC:
-    r_short_m = (1 + rates[f"r_{esc}"]).pow(1/12) - 1
+    curva    = CURVAS[esc]
     r_mort_m  = (1 + rates[f"hipoteca_var_{esc}"]).pow(1/12) - 1
 
     saldo = MONTO
@@ -109,17 +108,14 @@ for esc in ESC:
         cf_var.append(interes + MONTO / N_MESES)
     cf_var = np.array(cf_var)
 
-    ahorro = []
-    for sp in spreads_pb:
-        prima_m = (sp/1e4) / 12          # de pb a fracción
-        cuota_fija = npf.pmt(r_fija_m + prima_m, N_MESES, -MONTO)
+    # todos los spreads de una vez: matriz (n_spreads, N_MESES) · curva
+    primas_m   = (spreads_pb/1e4) / 12          # de pb a fracción
+    cuotas_fij = npf.pmt(r_fija_m + primas_m, N_MESES, -MONTO)
+    cf_fix     = np.repeat(cuotas_fij[:, None], N_MESES, axis=1)
 
-        cf_fix = np.full(N_MESES, cuota_fija)
-        vp_var = vp(cf_var, r_short_m.iloc[:N_MESES].values)
-        vp_fix = vp(cf_fix, r_short_m.iloc[:N_MESES].values)
-        ahorro.append((vp_fix - vp_var)/1e6)   # millones
-
-    tornado[esc] = ahorro
+    vp_var = curva.vp(cf_var)
+    vp_fix = curva.vp(cf_fix)
+    tornado[esc] = list((vp_fix - vp_var)/1e6)  # millones
 
 # --------------------------- tornado plot horizontal ---------------------------------
 fig, ax = plt.subplots(figsize=(7,4))
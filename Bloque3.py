@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
+from curvas import CurvaDescuento
 
 # ---------- Rutas ----------
 BASE         = Path(__file__).parent
@@ -17,10 +18,24 @@ FIG_DIR.mkdir(exist_ok=True)
 N        = 180                    # meses
 SALDO0   = 100_000_000            # COP
 r_disc   = 0.10                   # 10 % EA
-r_disc_m = (1 + r_disc) ** (1/12) - 1
+# Curva opcional por nodos {mes: tasa cero EA}, p. ej. {60: 0.095, 120: 0.105};
+# None → curva plana con r_disc (criterio original)
+NODOS_CURVA = None
 
 escenarios = ["Optimista", "Base", "Pesimista"]
 
+# ---------- Curva de descuento (común a los tres escenarios) ----------
+# validación: con un solo nodo la curva interpolada debe ser la plana
+if not np.allclose(CurvaDescuento.interpolada([N], [r_disc], N).factores,
+                   CurvaDescuento.plana(r_disc, N).factores, rtol=1e-12):
+    raise RuntimeError("Curva interpolada inconsistente con la curva plana")
+
+if NODOS_CURVA is None:
+    CURVA = CurvaDescuento.plana(r_disc, N)
+else:
+    CURVA = CurvaDescuento.interpolada(list(NODOS_CURVA),
+                                       list(NODOS_CURVA.values()), N)
+
 # ---------- Lectura de insumos ----------
 df_sim   = pd.read_csv(SIM_RATES, index_col="Mes")
 spreads  = pd.read_excel(SPREAD_FILE, sheet_name="Spreads", index_col="Mes")
@@ -57,9 +72,7 @@ for esc in escenarios:
     cuotas_var  = flujo_cuotas(tasas_var,  SALDO0)
     cuotas_swap = flujo_cuotas(tasas_swap, SALDO0)
 
-    t = np.arange(1, N + 1)
-    PV_var  = (cuotas_var  / (1 + r_disc_m) ** t).sum()
-    PV_swap = (cuotas_swap / (1 + r_disc_m) ** t).sum()
+    PV_var, PV_swap = CURVA.vp(np.vstack([cuotas_var, cuotas_swap]))
 
     ahorro_abs = PV_var - PV_swap
     ahorro_pct = ahorro_abs / (-PV_var)
@@ -3,6 +3,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
+from curvas import CurvaDescuento
+from var_ahorro import calibra_vasicek, simula_vasicek, ahorros_swap
 
 # ---------- rutas ----------
 BASE = Path(__file__).parent
@@ -19,28 +21,10 @@ CONF       = 0.95
 ALPHA      = 1 - CONF
 SALDO0     = 100_000_000     # COP
 r_desc_EA  = 0.10
-r_desc_m   = (1+r_desc_EA)**(1/12) - 1
+CURVA      = CurvaDescuento.plana(r_desc_EA, HORIZON)
 
 ESCENARIOS = ["Optimista", "Base", "Pesimista"]     # orden coherente
 
-# ---------- helpers ----------
-def pmt(rate, nper, pv):
-    """Cuota nivelada (vectorizada)"""
-    rate = np.asarray(rate, dtype=float)
-    return np.where(rate==0, pv/nper, rate*pv/(1-(1+rate)**-nper))
-
-def flujo_cuotas(tasas, saldo0):
-    n = len(tasas)
-    saldo = saldo0
-    cuotas = np.empty(n)
-    for k, r in enumerate(tasas):
-        c = pmt(r, n-k, saldo)
-        cuotas[k] = -c
-        int_k = saldo*r
-        amort = c - int_k
-        saldo -= amort
-    return cuotas
-
 # ---------- leer insumos ----------
 df_sim = pd.read_csv(SIM_RATES_CSV, index_col="Mes")
 spread_row = (pd.read_excel(SPREADS_XLSX, sheet_name="Spreads",
@@ -53,36 +37,12 @@ results = []
 for esc in ESCENARIOS:
     r_hist = df_sim[f"r_{esc}"].values[:HORIZON]
 
-    # --- calibrar Vasicek ---
-    y_t, y_tm1 = r_hist[1:], r_hist[:-1]
-    beta   = np.polyfit(y_tm1, y_t, 1)[0]
-    kappa  = -np.log(beta)
-    mu     = np.mean(r_hist)
-    sigma  = np.std(y_t - beta*y_tm1) * np.sqrt(2*kappa/(1-beta**2))
-
-    # --- simular ---
-    rng = np.random.default_rng(42)
-    r0  = r_hist[-1]
-    sim_r = np.empty((N_PATHS, HORIZON))
-    for p in range(N_PATHS):
-        r = r0
-        for t in range(HORIZON):
-            r += kappa*(mu-r) + sigma*rng.standard_normal()
-            sim_r[p,t] = max(r, 0)
+    # --- calibrar Vasicek y simular (var_ahorro.py) ---
+    kappa, mu, sigma = calibra_vasicek(r_hist)
+    sim_r = simula_vasicek(r_hist[-1], kappa, mu, sigma, N_PATHS, HORIZON)
 
     # --- ahorro por trayectoria ---
-    spr = SPREADS[esc]
-    tiempos = np.arange(1, HORIZON+1)
-
-    ahorros = np.empty(N_PATHS)
-    for i in range(N_PATHS):
-        r_var  = sim_r[i]
-        r_fix  = r_var + spr
-        cu_var = flujo_cuotas(r_var, SALDO0)[:HORIZON]
-        cu_fix = flujo_cuotas(r_fix, SALDO0)[:HORIZON]
-        pv_var = (cu_var/(1+r_desc_m)**tiempos).sum()
-        pv_fix = (cu_fix/(1+r_desc_m)**tiempos).sum()
-        ahorros[i] = pv_var - pv_fix
+    ahorros = ahorros_swap(sim_r, SPREADS[esc], SALDO0, CURVA)
 
     VaR_abs = np.percentile(ahorros, ALPHA*100)
     VaR_pct = VaR_abs/ahorros.mean()
@@ -0,0 +1,111 @@
+# Bloque5.py – Perfil de exposición (EE / PFE 95 %) y CVA del swap (180 m)
+# ------------------------------------------------------------------
+# • Reutiliza el cubo Monte Carlo del Bloque 1 (sim_cube_bloque1.npz)
+# • Valora el swap pagador con bonos cero Vasicek analíticos
+#   en una sola pasada paths × fechas (ver exposicion.py)
+# • Tasa fija = tasa par Vasicek al inicio (V₀ ≈ 0) salvo que se fije TASA_FIJA
+# • Salida: CSV con el perfil, CSV con el CVA y figura EE / PFE
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+from exposicion import (valor_swap_pagador, valor_swap_revaloracion,
+                        valor_swap_fecha, tasa_par_vasicek,
+                        perfil_exposicion, cva)
+
+# ---------- rutas ----------
+BASE      = Path(__file__).parent
+CUBO_NPZ  = BASE / "sim_cube_bloque1.npz"
+OUT_CSV   = BASE / "bloque5_exposicion.csv"
+OUT_CVA   = BASE / "bloque5_CVA.csv"
+FIG_DIR   = BASE / "figs_bloque5"
+FIG_DIR.mkdir(exist_ok=True)
+
+# ---------- parámetros ----------
+NOCIONAL      = 100_000_000     # COP (mismo crédito de los Bloques 2‑4)
+CONF          = 0.95
+SPREAD_CDS_PB = 150             # riesgo de la contraparte
+RECUPERACION  = 0.40
+TASA_FIJA     = None            # tasa del contrato; None → tasa par al inicio
+N_VALIDACION  = 20              # paths para validar contra revaloración directa
+
+ESCENARIOS = ["Optimista", "Base", "Pesimista"]
+
+if not CUBO_NPZ.exists():
+    raise FileNotFoundError(f"Cubo no encontrado: {CUBO_NPZ} (corre Bloque1.py)")
+
+cubo = np.load(CUBO_NPZ)
+
+# ---------- loop escenarios ----------
+perfiles, resumen = [], []
+
+for esc in ESCENARIOS:
+    r = cubo[f"r_{esc}"]
+    alpha, mu, sigma, r0 = cubo[f"params_{esc}"]
+    n_meses = r.shape[1]
+
+    # --- tasa fija y valor al inicio ---
+    K = (tasa_par_vasicek(r0, n_meses, alpha, mu, sigma)
+         if TASA_FIJA is None else TASA_FIJA)
+    V0 = float(valor_swap_fecha(r0, n_meses, alpha, mu, sigma, K, NOCIONAL))
+    V0 = float(round(V0))             # al peso; evita imprimir "-0"
+    print(f"{esc:10s} | K = {K*100:6.3f} %  V₀ = {V0:,.0f} COP")
+
+    # --- validación: motor vectorizado vs revaloración fecha a fecha ---
+    r_val = r[:N_VALIDACION]
+    v_rapido = valor_swap_pagador(r_val, alpha, mu, sigma, K, NOCIONAL)
+    v_directo = valor_swap_revaloracion(r_val, alpha, mu, sigma, K, NOCIONAL)
+    if not np.allclose(v_rapido, v_directo, rtol=1e-9, atol=1e-3):
+        err = np.abs(v_rapido - v_directo).max()
+        raise RuntimeError(f"Motor de exposición inconsistente ({esc}): "
+                           f"error máx {err:,.4f} COP")
+
+    valores = valor_swap_pagador(r, alpha, mu, sigma, K, NOCIONAL)
+    perfil  = perfil_exposicion(valores, r, r0, V0, conf=CONF)
+    cva_esc, perfil = cva(perfil, SPREAD_CDS_PB, RECUPERACION)
+
+    perfiles.append(perfil.assign(Escenario=esc))
+    resumen.append({"Escenario": esc,
+                    "Tasa_fija": K,
+                    "V0":        V0,
+                    "EE_max":    perfil["EE"].max(),
+                    "PFE_max":   perfil[f"PFE_{CONF*100:.0f}"].max(),
+                    "CVA":       cva_esc,
+                    "CVA_pb":    cva_esc / NOCIONAL * 1e4})
+
+# ---------- tabla y CSV ----------
+df_perfil = pd.concat(perfiles, ignore_index=True)
+df_perfil.to_csv(OUT_CSV, index=False)
+
+df_cva = pd.DataFrame(resumen).set_index("Escenario")
+df_cva.to_csv(OUT_CVA, float_format="%.4f")
+
+print("\n------ BLOQUE 5 – EXPOSICIÓN Y CVA (180 m) ------")
+show = df_cva.copy()
+show["Tasa_fija"] = show["Tasa_fija"].map(lambda x: f"{x:.3%}")
+for col in ("V0", "EE_max", "PFE_max", "CVA"):
+    show[col] = show[col].map(lambda x: f"{x:,.0f}")
+show["CVA_pb"] = show["CVA_pb"].map(lambda x: f"{x:.1f} pb")
+print(show.to_string())
+
+# ---------- gráfico ----------
+colores = ["#2ca02c", "#1f77b4", "#d62728"]
+plt.figure(figsize=(9, 5))
+for esc, color in zip(ESCENARIOS, colores):
+    p = df_perfil[df_perfil["Escenario"] == esc]
+    plt.plot(p["Mes"], p["EE"] / 1e6, color=color, label=f"EE {esc}")
+    plt.plot(p["Mes"], p[f"PFE_{CONF*100:.0f}"] / 1e6, color=color, ls="--",
+             label=f"PFE {CONF:.0%} {esc}")
+
+plt.title("Perfil de exposición del swap pagador de fijo • Colombia")
+plt.xlabel("Mes")
+plt.ylabel("Exposición (millones COP)")
+plt.legend(fontsize=8, ncol=2)
+plt.tight_layout()
+
+fig_path = FIG_DIR / "exposicion_bloque5.png"
+plt.savefig(fig_path, dpi=120)
+print(f"\n✅ Figura guardada en {fig_path.relative_to(BASE)}")
+
+plt.show()
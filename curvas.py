@@ -0,0 +1,117 @@
+"""
+curvas.py
+=========
+Curva de descuento compartida por todos los bloques del proyecto de swaps
+hipotecarios.  Antes cada bloque descontaba a su manera (`np.cumprod` en el
+Bloque 2, `(1 + r) ** t` en los Bloques 3 y 4); ahora la curva se construye
+**una sola vez** por escenario (o por conjunto de trayectorias) y los
+factores de descuento quedan guardados en un arreglo denso.
+
+Formas del arreglo `factores`
+-----------------------------
+* Curva plana o interpolada    → `(n_meses,)`
+* Curva estocástica (por path) → `(n_paths, n_meses)` o `(n_meses,)` si se
+  pasa una sola trayectoria.
+
+El método `vp()` descuenta cualquier bloque de flujos con un único
+producto punto (`einsum`) sobre todas las trayectorias, de modo que los
+kernels de valor presente no necesitan bucles.
+
+Uso rápido
+~~~~~~~~~~
+```python
+from curvas import CurvaDescuento
+
+curva = CurvaDescuento.plana(0.10, 180)          # 10 % EA
+pv    = curva.vp(cuotas)                         # cuotas: (180,) o (P, 180)
+```
+"""
+
+import numpy as np
+
+
+def tasa_mensual(tasa_ea):
+    """Convierte una tasa efectiva anual (proporción) a tasa mensual."""
+    return (1 + np.asarray(tasa_ea, dtype=float)) ** (1/12) - 1
+
+
+class CurvaDescuento:
+    """Factores de descuento mensuales precalculados.
+
+    No se instancia directamente: use `plana`, `estocastica` o
+    `interpolada`.
+
+    Attributes
+    ----------
+    factores : np.ndarray
+        Factor de descuento al cierre de cada mes, `1/∏(1+r_m)`.
+    """
+
+    def __init__(self, factores):
+        self.factores = factores
+
+    # ------------------------------------------------------------------
+    # Constructores
+    # ------------------------------------------------------------------
+    @classmethod
+    def plana(cls, tasa_ea: float, n_meses: int) -> "CurvaDescuento":
+        """Curva con una única tasa efectiva anual para todo el plazo."""
+        r_m = float(tasa_mensual(tasa_ea))
+        t = np.arange(1, n_meses + 1)
+        return cls((1 + r_m) ** -t)
+
+    @classmethod
+    def estocastica(cls, tasas_m) -> "CurvaDescuento":
+        """Curva a partir de tasas **mensuales** simuladas.
+
+        Parameters
+        ----------
+        tasas_m : array-like
+            `(n_meses,)` para una trayectoria o `(n_paths, n_meses)` para
+            un cubo de trayectorias.  El producto acumulado se hace sobre
+            el último eje.
+        """
+        tasas_m = np.asarray(tasas_m, dtype=float)
+        return cls(np.cumprod(1 / (1 + tasas_m), axis=-1))
+
+    @classmethod
+    def interpolada(cls, plazos_meses, tasas_ea, n_meses: int) -> "CurvaDescuento":
+        """Curva cero interpolando linealmente tasas EA entre nodos.
+
+        Parameters
+        ----------
+        plazos_meses : array-like
+            Nodos de la curva en meses (crecientes), p. ej. `[60, 120]`.
+        tasas_ea : array-like
+            Tasas cero efectivas anuales en cada nodo (proporción).
+        n_meses : int
+            Plazo de la curva; fuera de los nodos la tasa se mantiene plana.
+        """
+        t = np.arange(1, n_meses + 1)
+        z = np.interp(t, np.asarray(plazos_meses, dtype=float),
+                      np.asarray(tasas_ea, dtype=float))
+        return cls((1 + z) ** (-t / 12))
+
+    # ------------------------------------------------------------------
+    # Propiedades y kernels
+    # ------------------------------------------------------------------
+    @property
+    def n_meses(self) -> int:
+        return self.factores.shape[-1]
+
+    def vp(self, cf):
+        """Valor presente de los flujos *cf* con un solo producto punto.
+
+        Los ejes iniciales se alinean por broadcasting:
+
+        * `cf (n,)`   con curva `(n,)`    → escalar
+        * `cf (k, n)` con curva `(n,)`    → `(k,)`  (p. ej. varios spreads)
+        * `cf (n,)`   con curva `(P, n)`  → `(P,)`
+        * `cf (P, n)` con curva `(P, n)`  → `(P,)`  (flujo y curva por path)
+        """
+        cf = np.asarray(cf, dtype=float)
+        if cf.shape[-1] != self.n_meses:
+            raise ValueError(
+                f"Flujos con {cf.shape[-1]} meses y curva con {self.n_meses}."
+            )
+        return np.einsum("...n,...n->...", cf, self.factores)
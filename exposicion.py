@@ -0,0 +1,180 @@
+"""
+exposicion.py
+=============
+Motor de exposición del swap pagador de fijo (pagar fijo ↔ recibir IBR)
+sobre todo su plazo.  Reutiliza el cubo de trayectorias Vasicek que guarda
+el Bloque 1 (`sim_cube_bloque1.npz`) y valora el swap con precios
+**analíticos** de bonos cero Vasicek, de modo que no hace falta revalorar
+el swap fecha a fecha ni trayectoria a trayectoria.
+
+Valor del swap pagador (nocional bullet, cupón mensual) en la fecha t_k,
+justo después del pago de ese mes:
+
+    V_k = N · [1 − P(t_k, T)]  −  N · K · Δt · Σ_{j>k} P(t_k, t_j)
+
+La pata flotante vale N·(1 − P(t_k, T)) porque se resetea cada mes.
+Por defecto K es la tasa par al inicio (`tasa_par_vasicek`), de modo que
+V_0 ≈ 0 y el perfil mide exposición de un contrato a mercado.
+
+Convención de tasas
+-------------------
+Las tasas del cubo se tratan como **tasa corta continua** r (la variable
+del modelo Vasicek).  Tanto los bonos cero, P = A·exp(−B·r), como el
+descuento de la EE, D(t_k) = exp(−Σ_{j<k} r_j·Δt), usan esa misma convención; la
+conversión a tasa mensual para `CurvaDescuento` es explícita
+(`tasa_mensual_continua`).
+
+Aproximación: el cubo del Bloque 1 sale de una dinámica con saltos
+mensuales acotados (±150 pb) y piso del 1 %, mientras que los precios son
+los de Vasicek sin restricciones en forma cerrada.  Los valores son, por
+tanto, una aproximación; el efecto es pequeño mientras el cap y el piso
+rara vez se activan.
+
+Métricas
+--------
+* EE   : exposición esperada  E[max(V, 0)]
+* PFE  : exposición potencial futura (percentil *conf* de max(V, 0))
+* CVA  : unilateral, (1 − R) · Σ EE_desc(t_k) · PD(t_{k−1}, t_k), con
+         hazard rate plano λ = spread_cds / (1 − R).
+"""
+
+import numpy as np
+import pandas as pd
+
+from curvas import CurvaDescuento
+
+DT = 1/12                     # paso mensual
+
+
+def vasicek_AB(tau, alpha, mu, sigma):
+    """Coeficientes (ln A, B) del bono cero Vasicek P = A·exp(−B·r)."""
+    tau = np.asarray(tau, dtype=float)
+    B = (1 - np.exp(-alpha * tau)) / alpha
+    lnA = (B - tau) * (mu - sigma**2 / (2 * alpha**2)) - sigma**2 * B**2 / (4 * alpha)
+    return lnA, B
+
+
+def precio_bono_vasicek(r, tau, alpha, mu, sigma):
+    """Precio analítico del bono cero con vencimiento *tau* años (vectorizado)."""
+    lnA, B = vasicek_AB(tau, alpha, mu, sigma)
+    return np.exp(lnA - B * np.asarray(r, dtype=float))
+
+
+def tasa_mensual_continua(r, dt=DT):
+    """Tasa mensual simple equivalente a la tasa corta continua *r*."""
+    return np.expm1(np.asarray(r, dtype=float) * dt)
+
+
+def valor_swap_fecha(r, meses_restantes, alpha, mu, sigma, tasa_fija,
+                     nocional, dt=DT):
+    """Valor del swap pagador con *meses_restantes* pagos, dada la tasa *r*.
+
+    Revaloración directa (un bono cero por pago pendiente).  Se usa para
+    V_0 y como referencia de `valor_swap_pagador`.
+    """
+    r = np.asarray(r, dtype=float)
+    tau = np.arange(1, meses_restantes + 1) * dt
+    bonos = precio_bono_vasicek(r[..., None], tau, alpha, mu, sigma)
+    p_T = bonos[..., -1] if meses_restantes else np.ones_like(r)
+    return nocional * (1 - p_T) - nocional * tasa_fija * dt * bonos.sum(axis=-1)
+
+
+def tasa_par_vasicek(r0, n_meses, alpha, mu, sigma, dt=DT):
+    """Tasa fija par al inicio: K = (1 − P(0,T)) / (Δt · Σ P(0,t_j))."""
+    bonos = precio_bono_vasicek(r0, np.arange(1, n_meses + 1) * dt,
+                                alpha, mu, sigma)
+    return float((1 - bonos[-1]) / (dt * bonos.sum()))
+
+
+def valor_swap_pagador(r, alpha, mu, sigma, tasa_fija, nocional, dt=DT):
+    """Valor del swap pagador de fijo en cada (trayectoria, mes).
+
+    Parameters
+    ----------
+    r : np.ndarray
+        Cubo de tasas cortas `(n_paths, n_meses)`; la columna k es la tasa
+        al cierre del mes k+1.
+    alpha, mu, sigma : float
+        Parámetros Vasicek anuales con los que se simuló el cubo.
+    tasa_fija : float
+        Tasa fija anual del swap (proporción).
+    nocional : float
+        Nocional (COP).
+
+    Returns
+    -------
+    np.ndarray
+        `(n_paths, n_meses)`; la última columna es 0 (swap vencido).
+    """
+    r = np.asarray(r, dtype=float)
+    n = r.shape[-1]
+
+    # pata flotante: un solo bono cero por fecha (plazo remanente n-1-k)
+    tau_rem = (n - 1 - np.arange(n)) * dt
+    flotante = nocional * (1 - precio_bono_vasicek(r, tau_rem, alpha, mu, sigma))
+
+    # anualidad Σ_j P(t_k, t_j): un paso por plazo m, cada uno sobre paths × fechas
+    lnA, B = vasicek_AB(np.arange(1, n) * dt, alpha, mu, sigma)
+    anualidad = np.zeros_like(r)
+    for m in range(1, n):
+        vivas = n - m                          # fechas con ≥ m pagos pendientes
+        anualidad[..., :vivas] += np.exp(lnA[m - 1] - B[m - 1] * r[..., :vivas])
+
+    return flotante - nocional * tasa_fija * dt * anualidad
+
+
+def valor_swap_revaloracion(r, alpha, mu, sigma, tasa_fija, nocional, dt=DT):
+    """Misma matriz que `valor_swap_pagador`, revalorando fecha a fecha.
+
+    Lenta; solo para validar el motor vectorizado sobre un cubo pequeño.
+    """
+    r = np.asarray(r, dtype=float)
+    n = r.shape[-1]
+    valores = np.empty_like(r)
+    for k in range(n):
+        valores[..., k] = valor_swap_fecha(r[..., k], n - 1 - k, alpha, mu,
+                                           sigma, tasa_fija, nocional, dt)
+    return valores
+
+
+def perfil_exposicion(valores, r, r0, v0=0.0, conf=0.95, dt=DT):
+    """EE, PFE y EE descontada por mes a partir de la matriz de valores.
+
+    El perfil incluye el mes 0 (valor inicial *v0*, común a todas las
+    trayectorias).  Cada mes se descuenta con la tasa vigente al **inicio**
+    del mes (r0 para el primero, luego la columna anterior del cubo), de
+    forma que EE_desc(t_k) = E[exp(−Σ_{j<k} r_j·Δt) · max(V_k, 0)].
+    """
+    r = np.asarray(r, dtype=float)
+    n_paths = r.shape[0]
+    r_inicio = np.concatenate([np.full((n_paths, 1), r0), r[:, :-1]], axis=1)
+    curva = CurvaDescuento.estocastica(tasa_mensual_continua(r_inicio, dt))
+
+    expo = np.concatenate([np.full((n_paths, 1), max(v0, 0.0)),
+                           np.maximum(valores, 0)], axis=1)
+    factores = np.concatenate([np.ones((n_paths, 1)), curva.factores], axis=1)
+    return pd.DataFrame({
+        "Mes": np.arange(expo.shape[-1]),
+        "EE": expo.mean(axis=0),
+        f"PFE_{conf*100:.0f}": np.percentile(expo, conf * 100, axis=0),
+        "EE_desc": (factores * expo).mean(axis=0),
+    })
+
+
+def cva(perfil, spread_cds_pb=150, recuperacion=0.40, dt=DT):
+    """CVA unilateral sobre un perfil de `perfil_exposicion`.
+
+    Devuelve (cva_total, perfil) con las columnas `PD_marginal` y
+    `CVA_contrib` añadidas.
+    """
+    lgd = 1 - recuperacion
+    hazard = (spread_cds_pb / 1e4) / lgd
+    t = perfil["Mes"].to_numpy() * dt
+    supervivencia = np.exp(-hazard * np.concatenate(([0.0], t)))
+    pd_marginal = supervivencia[:-1] - supervivencia[1:]
+
+    perfil = perfil.assign(
+        PD_marginal=pd_marginal,
+        CVA_contrib=lgd * perfil["EE_desc"].to_numpy() * pd_marginal,
+    )
+    return perfil["CVA_contrib"].sum(), perfil
@@ -0,0 +1,373 @@
+"""
+servicio.py
+===========
+Servicio local de valoración que mantiene **en memoria** los parámetros de
+`config_swaps`, los spreads de `spread_maestro.xlsx`, el cubo Monte Carlo
+del Bloque 1 (`sim_cube_bloque1.npz`) y las trayectorias de VaR del
+Bloque 4.  Cada pregunta de la mesa ("¿cuánto es el ahorro con spread X en
+el escenario Y?") se responde sin volver a leer Excel, simular ni graficar.
+
+Modelos (cada tipo reproduce el bloque publicado correspondiente)
+-----------------------------------------------------------------
+* `ahorro` y `sensibilidad` → **Bloque 2** (crédito de 100 MM, amortización
+  lineal, cuota fija = PMT(13 % EA + spread), descuento con la curva IBR
+  fwd), promediado sobre todas las trayectorias del cubo:
+
+      ahorro = VP_fija − VP_var        (> 0: la cuota variable sale más barata)
+
+  Al arrancar se precalculan, por trayectoria y mes, el VP acumulado de la
+  cuota variable `Σ_{t≤h} cf_var · D` y la anualidad `Σ_{t≤h} D`, así que
+  el ahorro de cualquier spread y horizonte h es
+  `anualidad_h · cuota_fija − VP_var_h`.  `sensibilidad` es el cambio del
+  ahorro medio por +1 pb de spread.
+
+* `var` → **Bloque 4** (mismas 10 000 trayectorias Vasicek recalibradas a
+  12 meses, semilla 42, cuotas PMT re‑amortizadas, descuento plano 10 % EA,
+  ahorro = VP_var − VP_swap con cuotas como egresos).  Con el spread de
+  `spread_maestro.xlsx` los campos `Ahorro_med`, `VaR_abs` y `VaR_pct`
+  coinciden con `bloque4_VaR.csv`: ambos usan los kernels de
+  `var_ahorro.py`.  El horizonte es fijo: 12 meses.
+
+Protocolo
+---------
+TCP, una línea JSON por petición (o una lista JSON = lote).  Campos:
+
+    {"id": 1, "tipo": "ahorro" | "sensibilidad" | "var",
+     "escenario": "Base", "spread_pb": 250, "horizonte": 180}
+
+`spread_pb` es opcional (por defecto el de `spread_maestro.xlsx`) y debe
+ser un número JSON (no texto) entre 0 y `SPREAD_MAX_PB`; `horizonte`
+también es opcional (entero, por defecto todo el plazo; 12 para `var`).
+Un resultado no finito se devuelve como error de esa petición, sin
+afectar al resto del lote.  Las peticiones que llegan casi al mismo tiempo, de
+uno o varios clientes, se agrupan en un solo lote y se evalúan juntas.
+
+Uso rápido
+~~~~~~~~~~
+```bash
+python servicio.py                                   # escucha en 127.0.0.1:8765
+echo '{"id":1,"tipo":"var","escenario":"Pesimista","spread_pb":300}' \\
+    | nc 127.0.0.1 8765
+```
+"""
+
+import asyncio
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import numpy_financial as npf
+import pandas as pd
+
+from config_swaps import get_params
+from curvas import CurvaDescuento, tasa_mensual
+from var_ahorro import (calibra_vasicek, simula_vasicek, flujo_cuotas,
+                        ahorros_swap)
+
+# ----------------------------------------------------------------------
+#  Rutas y parámetros (idénticos a Bloque1/Bloque2/Bloque4)
+# ----------------------------------------------------------------------
+BASE          = Path(__file__).parent
+CUBO_NPZ      = BASE / "sim_cube_bloque1.npz"
+SIM_RATES_CSV = BASE / "sim_rates_bloque1.csv"
+SPREADS_XLSX  = BASE / "spread_maestro.xlsx"
+
+ESCENARIOS   = ("Optimista", "Base", "Pesimista")
+TIPOS        = ("ahorro", "sensibilidad", "var")
+SPREAD_MAX_PB = 2_000           # 20 pp: tope razonable para el spread del swap
+
+# Bloque 2
+MONTO        = 100_000_000      # COP
+N_MESES      = 180
+TASA_FIJA_EA = 0.13             # "tarifa de lista" 13 % EA
+FLOOR_SPREAD = 0.05             # piso hipoteca: r + 5 pp (Bloque 1)
+
+# Bloque 4
+VAR_HORIZON  = 12               # meses
+VAR_N_PATHS  = 10_000
+VAR_SALDO0   = 100_000_000      # COP
+VAR_DESC_EA  = 0.10
+CONF         = 0.95
+VAR_CHUNK    = 32               # spreads distintos evaluados por bloque
+
+HOST, PUERTO = "127.0.0.1", 8765
+VENTANA_MS   = 2.0              # espera máxima para juntar un lote
+MAX_LOTE     = 4096
+LIMITE_LINEA = MAX_LOTE * 256   # bytes por línea JSON (lote de MAX_LOTE cabe)
+
+
+class MotorPrecios:
+    """Estado caliente y kernels vectorizados del servicio.
+
+    Parameters
+    ----------
+    cubo_path : str | Path | None
+        Cubo del Bloque 1.  Si es None se usa `CUBO_NPZ`.
+    """
+
+    def __init__(self, cubo_path=None):
+        cubo_path = Path(cubo_path) if cubo_path is not None else CUBO_NPZ
+        if not cubo_path.exists():
+            raise FileNotFoundError(
+                f"Cubo no encontrado: {cubo_path} (corre Bloque1.py)"
+            )
+
+        self.params = get_params("Colombia")
+        spread_row = (pd.read_excel(SPREADS_XLSX, sheet_name="Spreads",
+                                    index_col="Mes").iloc[0])
+        self.spread_pb = {esc: spread_row[f"spread_{esc}"] * 1e4
+                          for esc in ESCENARIOS}
+        self.r_fija_m = float(tasa_mensual(TASA_FIJA_EA))
+
+        # ---------- Bloque 2 sobre el cubo ----------
+        spread_mortgage = self.params["mortgage_variable"] - self.params["tasa_inicial"]
+        saldos = MONTO * (1 - np.arange(N_MESES) / N_MESES)
+
+        self.vp_var_acum, self.anualidad_acum = {}, {}
+        with np.load(cubo_path) as cubo:
+            for esc in ESCENARIOS:
+                r = cubo[f"r_{esc}"][:, :N_MESES]
+                curva = CurvaDescuento.estocastica(tasa_mensual(r))
+                hipoteca = np.maximum(r + spread_mortgage, r + FLOOR_SPREAD)
+                cf_var = saldos * tasa_mensual(hipoteca) + MONTO / N_MESES
+
+                self.vp_var_acum[esc] = np.cumsum(cf_var * curva.factores, axis=1)
+                self.anualidad_acum[esc] = np.cumsum(curva.factores, axis=1)
+
+        self.n_paths = next(iter(self.anualidad_acum.values())).shape[0]
+
+        # ---------- Bloque 4: trayectorias y VP variable ----------
+        df_sim = pd.read_csv(SIM_RATES_CSV, index_col="Mes")
+        self.curva_var = CurvaDescuento.plana(VAR_DESC_EA, VAR_HORIZON)
+        self.var_r, self.var_pv_var = {}, {}
+        for esc in ESCENARIOS:
+            r_hist = df_sim[f"r_{esc}"].values[:VAR_HORIZON]
+            kappa, mu, sigma = calibra_vasicek(r_hist)
+            sim_r = simula_vasicek(r_hist[-1], kappa, mu, sigma,
+                                   VAR_N_PATHS, VAR_HORIZON)
+            self.var_r[esc] = sim_r
+            self.var_pv_var[esc] = self.curva_var.vp(
+                flujo_cuotas(sim_r, VAR_SALDO0))
+
+    # ------------------------------------------------------------------
+    def _valida(self, req: dict) -> tuple:
+        """Normaliza una petición → (tipo, escenario, spread_pb, horizonte)."""
+        if not isinstance(req, dict):
+            raise ValueError("Cada petición debe ser un objeto JSON.")
+        tipo = req.get("tipo", "ahorro")
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo '{tipo}' no soportado; use uno de {TIPOS}.")
+        esc = str(req.get("escenario", "Base")).capitalize()
+        if esc not in ESCENARIOS:
+            raise ValueError(f"Escenario '{esc}' no encontrado.")
+
+        spread_pb = req.get("spread_pb", self.spread_pb[esc])
+        if isinstance(spread_pb, bool) or not isinstance(spread_pb, (int, float)):
+            raise ValueError("spread_pb debe ser un número (pb), no texto ni null.")
+        spread_pb = float(spread_pb)
+        if not math.isfinite(spread_pb) or not 0 <= spread_pb <= SPREAD_MAX_PB:
+            raise ValueError(f"spread_pb fuera de rango: 0–{SPREAD_MAX_PB} pb.")
+
+        h_max = VAR_HORIZON if tipo == "var" else N_MESES
+        horizonte = req.get("horizonte", h_max)
+        if isinstance(horizonte, bool) or not isinstance(horizonte, int):
+            raise ValueError("horizonte debe ser un entero de meses.")
+        if tipo == "var" and horizonte != VAR_HORIZON:
+            raise ValueError(f"El VaR sigue al Bloque 4: horizonte fijo de "
+                             f"{VAR_HORIZON} meses.")
+        if not 1 <= horizonte <= N_MESES:
+            raise ValueError(f"Horizonte fuera de rango: 1–{N_MESES} meses.")
+        return tipo, esc, spread_pb, horizonte
+
+    def _ahorro_b2(self, esc, items, respuestas):
+        """Kernel Bloque 2: todas las peticiones ahorro/sensibilidad de *esc*."""
+        spreads = np.array([s[2] for _, _, s in items])
+        h_idx = np.array([s[3] for _, _, s in items]) - 1
+
+        vp_var = self.vp_var_acum[esc][:, h_idx]        # (P, k)
+        anual = self.anualidad_acum[esc][:, h_idx]      # (P, k)
+
+        # spread pedido y +1 pb (sensibilidad) en una sola llamada
+        primas_m = np.concatenate([spreads, spreads + 1]) / 1e4 / 12
+        cuotas = npf.pmt(self.r_fija_m + primas_m, N_MESES, -MONTO)
+        k = len(items)
+        ahorro = anual * cuotas[:k] - vp_var            # (P, k)
+        ahorro_up = anual * cuotas[k:] - vp_var
+
+        medio = ahorro.mean(axis=0)
+        vp_var_medio = vp_var.mean(axis=0)
+        sensib = ahorro_up.mean(axis=0) - medio
+
+        for j, (i, rid, (tipo, _, sp, h)) in enumerate(items):
+            resp = {"id": rid, "tipo": tipo, "escenario": esc,
+                    "spread_pb": sp, "horizonte": h,
+                    "ahorro_medio": float(medio[j])}
+            if tipo == "ahorro":
+                resp["ahorro_pct"] = float(medio[j] / vp_var_medio[j])
+            else:
+                resp["dAhorro_dpb"] = float(sensib[j])
+            respuestas[i] = _verifica_finita(resp)
+
+    def _var_b4(self, esc, items, respuestas):
+        """Kernel Bloque 4: un bloque (paths × spreads × meses) por tanda."""
+        spreads = np.array([s[2] for _, _, s in items]) / 1e4
+        unicos, inv = np.unique(spreads, return_inverse=True)
+
+        sim_r, pv_var = self.var_r[esc], self.var_pv_var[esc]
+        medio = np.empty(len(unicos))
+        var_abs = np.empty(len(unicos))
+        for a in range(0, len(unicos), VAR_CHUNK):
+            ahorros = ahorros_swap(sim_r, unicos[a:a + VAR_CHUNK], VAR_SALDO0,
+                                   self.curva_var, pv_var)      # (P, c)
+            medio[a:a + VAR_CHUNK] = ahorros.mean(axis=0)
+            var_abs[a:a + VAR_CHUNK] = np.percentile(ahorros, (1 - CONF) * 100,
+                                                     axis=0)
+
+        for j, (i, rid, (tipo, _, sp, h)) in enumerate(items):
+            u = inv[j]
+            respuestas[i] = _verifica_finita({
+                "id": rid, "tipo": tipo, "escenario": esc,
+                "spread_pb": sp, "horizonte": h, "conf": CONF,
+                "Ahorro_med": float(medio[u]),
+                "VaR_abs": float(var_abs[u]),
+                "VaR_pct": float(var_abs[u] / medio[u] * 100),
+            })
+
+    def evalua(self, reqs: list) -> list:
+        """Evalúa un lote completo: un kernel vectorizado por escenario y modelo."""
+        respuestas = [None] * len(reqs)
+        grupos = {}                      # (modelo, escenario) → [(i, id, spec)]
+        for i, req in enumerate(reqs):
+            rid = req.get("id") if isinstance(req, dict) else None
+            if isinstance(rid, float) and not math.isfinite(rid):
+                rid = None                   # p. ej. 1e999 → inf
+            try:
+                spec = self._valida(req)
+            except (ValueError, TypeError) as exc:
+                respuestas[i] = {"id": rid, "error": str(exc)}
+                continue
+            modelo = "var" if spec[0] == "var" else "ahorro"
+            grupos.setdefault((modelo, spec[1]), []).append((i, rid, spec))
+
+        for (modelo, esc), items in grupos.items():
+            if modelo == "var":
+                self._var_b4(esc, items, respuestas)
+            else:
+                self._ahorro_b2(esc, items, respuestas)
+
+        return respuestas
+
+
+def _verifica_finita(resp: dict) -> dict:
+    """Convierte en error (solo de esta petición) un resultado NaN/inf."""
+    if all(math.isfinite(v) for v in resp.values() if isinstance(v, float)):
+        return resp
+    return {"id": resp["id"],
+            "error": "El cálculo no produjo un resultado finito para esta petición."}
+
+
+def _rechaza_constante(nombre):
+    """json.loads acepta NaN/Infinity por defecto; el servicio no."""
+    raise ValueError(f"Constante no válida en JSON: {nombre}")
+
+
+def _a_json(out) -> bytes:
+    """Serializa la respuesta como JSON estricto (sin NaN/Infinity)."""
+    try:
+        texto = json.dumps(out, allow_nan=False)
+    except ValueError as exc:
+        texto = json.dumps({"id": None, "error": f"Respuesta no serializable: {exc}"})
+    return (texto + "\n").encode()
+
+
+class ServicioPrecios:
+    """Servidor asyncio que agrupa peticiones concurrentes en lotes."""
+
+    def __init__(self, motor: MotorPrecios, ventana_ms: float = VENTANA_MS,
+                 max_lote: int = MAX_LOTE):
+        self.motor = motor
+        self.ventana = ventana_ms / 1000
+        self.max_lote = max_lote
+        self._cola = None
+        self._tarea = None
+
+    async def consulta(self, req) -> dict:
+        """Encola una petición y espera su respuesta (evaluada en lote)."""
+        fut = asyncio.get_running_loop().create_future()
+        await self._cola.put((req, fut))
+        return await fut
+
+    async def _bucle_lotes(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.ventana
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            reqs = [req for req, _ in lote]
+            try:
+                respuestas = await asyncio.to_thread(self.motor.evalua, reqs)
+            except Exception as exc:             # no tumbar el servicio
+                respuestas = [{"id": None, "error": str(exc)}] * len(lote)
+            for (_, fut), resp in zip(lote, respuestas):
+                if not fut.done():
+                    fut.set_result(resp)
+
+    async def _atiende(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # línea más larga que LIMITE_LINEA: el flujo queda a
+                    # mitad de un mensaje, se responde y se cierra
+                    writer.write(_a_json({
+                        "id": None,
+                        "error": f"Línea JSON mayor a {LIMITE_LINEA} bytes; "
+                                 f"divida el lote.",
+                    }))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+
+                try:
+                    payload = json.loads(line, parse_constant=_rechaza_constante)
+                except ValueError as exc:
+                    out = {"id": None, "error": f"JSON inválido: {exc}"}
+                else:
+                    if isinstance(payload, list):
+                        out = await asyncio.gather(*(self.consulta(r) for r in payload))
+                    else:
+                        out = await self.consulta(payload)
+                writer.write(_a_json(out))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def sirve(self, host: str = HOST, puerto: int = PUERTO):
+        """Arranca el servidor y el bucle de lotes; corre hasta cancelarse."""
+        self._cola = asyncio.Queue()
+        self._tarea = asyncio.create_task(self._bucle_lotes())
+        server = await asyncio.start_server(self._atiende, host, puerto,
+                                            limit=LIMITE_LINEA)
+        print(f"✅ Servicio escuchando en {host}:{puerto} "
+              f"({self.motor.n_paths} trayectorias × {len(ESCENARIOS)} escenarios)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._tarea.cancel()
+
+
+# Ejecuta si se llama como script -------------------------
+if __name__ == "__main__":
+    asyncio.run(ServicioPrecios(MotorPrecios()).sirve())
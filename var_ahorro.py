@@ -0,0 +1,77 @@
+"""
+var_ahorro.py
+=============
+Kernels del VaR del ahorro a 12 meses (Bloque 4), compartidos por
+`Bloque4.py` y `servicio.py` para que ambos den exactamente el mismo
+número.  Cualquier cambio al modelo del VaR se hace aquí.
+
+Pasos
+-----
+1. `calibra_vasicek`  – re‑calibra (κ, μ, σ) a la ventana histórica.
+2. `simula_vasicek`   – Monte Carlo vectorizado (semilla fija; el orden de
+   los choques es trayectoria‑mes, igual que el doble bucle original).
+3. `ahorros_swap`     – cuotas re‑amortizadas (PMT) variable vs. swap,
+   descontadas con una `CurvaDescuento`; ahorro = VP_var − VP_swap con las
+   cuotas como egresos.
+"""
+
+import numpy as np
+
+
+def pmt(rate, nper, pv):
+    """Cuota nivelada (vectorizada)"""
+    rate = np.asarray(rate, dtype=float)
+    return np.where(rate==0, pv/nper, rate*pv/(1-(1+rate)**-nper))
+
+
+def flujo_cuotas(tasas, saldo0):
+    """Cuotas mes a mes (egresos); el último eje de *tasas* son los meses."""
+    tasas = np.asarray(tasas, dtype=float)
+    n = tasas.shape[-1]
+    saldo = np.full(tasas.shape[:-1], saldo0, dtype=float)
+    cuotas = np.empty(tasas.shape)
+    for k in range(n):
+        r = tasas[..., k]
+        c = pmt(r, n-k, saldo)
+        cuotas[..., k] = -c
+        int_k = saldo*r
+        amort = c - int_k
+        saldo = saldo - amort
+    return cuotas
+
+
+def calibra_vasicek(r_hist):
+    """(κ, μ, σ) de Vasicek por regresión AR(1) sobre *r_hist*."""
+    y_t, y_tm1 = r_hist[1:], r_hist[:-1]
+    beta  = np.polyfit(y_tm1, y_t, 1)[0]
+    kappa = -np.log(beta)
+    mu    = np.mean(r_hist)
+    sigma = np.std(y_t - beta*y_tm1) * np.sqrt(2*kappa/(1-beta**2))
+    return kappa, mu, sigma
+
+
+def simula_vasicek(r0, kappa, mu, sigma, n_paths, horizon, seed=42):
+    """Trayectorias (n_paths, horizon); tasa guardada con piso en 0."""
+    rng = np.random.default_rng(seed)
+    eps = rng.standard_normal((n_paths, horizon))
+    sim_r = np.empty((n_paths, horizon))
+    r = np.full(n_paths, r0, dtype=float)
+    for t in range(horizon):
+        r = r + (kappa*(mu-r) + sigma*eps[:, t])   # mismo orden que "r +="
+        sim_r[:, t] = np.maximum(r, 0)
+    return sim_r
+
+
+def ahorros_swap(sim_r, spread, saldo0, curva, pv_var=None):
+    """Ahorro por trayectoria con *spread* (fracción) sobre la tasa variable.
+
+    *spread* escalar → `(n_paths,)`; arreglo `(c,)` → `(n_paths, c)`, todos
+    los spreads en un solo bloque paths × spreads × meses.  *pv_var* permite
+    reutilizar el VP de la cuota variable ya calculado.
+    """
+    if pv_var is None:
+        pv_var = curva.vp(flujo_cuotas(sim_r, saldo0))
+    spr = np.asarray(spread, dtype=float)
+    tasas = sim_r[:, None, :] + spr.reshape(1, -1, 1)
+    ahorros = pv_var[:, None] - curva.vp(flujo_cuotas(tasas, saldo0))
+    return ahorros[:, 0] if spr.ndim == 0 else ahorros